@@ -0,0 +1,302 @@
+import threading
+from concurrent.futures import Future
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import streamlit as st
+import yfinance as yf
+from curl_cffi import requests as curl_requests
+
+_HIST_CACHE = Path(".cache/history")
+
+# Periods cheap enough to refetch that staleness matters more than the
+# transfer: they get the 60s memory TTL and skip the day-keyed disk read.
+_SHORT_PERIODS = frozenset({'1d', '5d', '1mo', '3mo', '6mo', '1y'})
+
+# Calendar span of each bounded period, for re-trimming incrementally
+# extended windows; 'max' (absent) is unbounded and never trimmed.
+_PERIOD_SPANS = {
+    '1d': pd.DateOffset(days=1), '5d': pd.DateOffset(days=5),
+    '1mo': pd.DateOffset(months=1), '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6), '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2), '5y': pd.DateOffset(years=5),
+    '10y': pd.DateOffset(years=10),
+}
+
+# In-flight download map: concurrent sessions asking for the same uncached
+# ticker wait on the first download's Future instead of re-issuing it
+# (thundering herd on the default "AAPL" would otherwise trip Yahoo
+# throttling). Entries live only while the download runs — the owner
+# removes its key before resolving the Future, so nothing accumulates.
+_inflight_lock = threading.Lock()
+_inflight = {}
+
+
+@st.cache_resource
+def _get_session():
+    """One process-wide impersonated session; keep-alive reuse saves the
+    ~100-300ms TLS handshake and fingerprint setup per fetch."""
+    return curl_requests.Session(impersonate="chrome")
+
+
+# --- MARKET DATA ENGINE (Yahoo Finance) ---
+class QuantEngine:
+    @staticmethod
+    def _ticker(symbol):
+        return yf.Ticker(symbol, session=_get_session())
+
+    @staticmethod
+    @st.cache_data(ttl=300, max_entries=128, show_spinner=False)
+    def fetch_quote(symbol):
+        """Live price snapshot via fast_info.
+
+        fast_info hits one lazy endpoint; Ticker.info would fire ~15
+        quoteSummary requests for fields the KPI row never reads."""
+        try:
+            fi = QuantEngine._ticker(symbol).fast_info
+            return {
+                'currentPrice': fi.last_price,
+                'marketCap': fi.market_cap,
+                'fiftyTwoWeekHigh': fi.year_high,
+                'fiftyTwoWeekLow': fi.year_low,
+            }
+        except Exception:
+            return None
+
+    @staticmethod
+    @st.cache_data(ttl=86400, max_entries=128, show_spinner=False)
+    def fetch_profile(symbol):
+        """Company name/sector/industry from exactly two quoteSummary modules.
+
+        These fields aren't in fast_info, but requesting just assetProfile
+        and price keeps the payload a fraction of the ~15-module dump a
+        full Ticker.info fallback would pull."""
+        url = f"https://query1.finance.yahoo.com/v10/finance/quoteSummary/{symbol}"
+        try:
+            r = _get_session().get(url, params={"modules": "assetProfile,price"}, timeout=10)
+            res = r.json()["quoteSummary"]["result"][0]
+        except Exception:
+            return None
+        profile, price = res.get("assetProfile", {}), res.get("price", {})
+        return {
+            'longName': price.get('longName'),
+            'sector': profile.get('sector'),
+            'industry': profile.get('industry'),
+        }
+
+    @staticmethod
+    @st.cache_data(ttl=300, max_entries=64, show_spinner="Fetching peer quotes...")
+    def fetch_peer_quotes(symbols):
+        """Quote snapshots for a peer group in a single batched request.
+
+        Yahoo's /v7/finance/quote accepts ~20 symbols per call, so the
+        whole group costs one TLS+TCP round-trip instead of one (or
+        several, via .info) per ticker."""
+        try:
+            r = _get_session().get(
+                "https://query1.finance.yahoo.com/v7/finance/quote",
+                params={"symbols": ",".join(symbols)}, timeout=10)
+            results = r.json()["quoteResponse"]["result"]
+        except Exception:
+            return {}
+        return {q['symbol']: {
+            'currentPrice': q.get('regularMarketPrice'),
+            'marketCap': q.get('marketCap'),
+            'trailingPE': q.get('trailingPE'),
+            'enterpriseValue': q.get('enterpriseValue'),
+            'profitMargins': q.get('profitMargins'),
+            'fiftyTwoWeekHigh': q.get('fiftyTwoWeekHigh'),
+            'fiftyTwoWeekLow': q.get('fiftyTwoWeekLow'),
+        } for q in results}
+
+    @staticmethod
+    def get_val(df, row):
+        """First-column scalar for a statement line item, or 0.0 if absent.
+
+        Indexing df.values once via get_loc avoids the chained
+        df.loc[row][0] path, which hashes the index and materializes an
+        intermediate Series per lookup on every rerun."""
+        idx = df.index
+        if row in idx:
+            v = df.values[idx.get_loc(row), 0]
+            return float(v) if v == v else 0.0  # NaN-safe
+        return 0.0
+
+    @staticmethod
+    def extract_items(df, rows):
+        """Batch scalar extraction for several statement line items.
+
+        One .loc slice plus one NumPy materialization replaces a
+        get_val call (and its index hash) per item; rows that are
+        missing or NaN are simply absent from the returned dict, so
+        callers' .get(key, 0.0) defaults apply to both."""
+        present = [r for r in rows if r in df.index]
+        vals = df.loc[present].iloc[:, 0].to_numpy(dtype=np.float64)
+        return {k: v for k, v in zip(present, vals) if v == v}
+
+    @staticmethod
+    def scale_statement(df):
+        """Scale a statement frame to billions or millions for display.
+
+        One fused NumPy sweep: a single nanmax reduction over abs values
+        picks the unit, then scale and round run in place on one working
+        copy of the frame — no intermediate abs-frame, division copy or
+        round copy on top of it. copy=True is load-bearing: under pandas
+        3 copy-on-write, to_numpy hands back a read-only view of the
+        block and the in-place ops would raise.
+
+        Returns a pyarrow.Table (line items as the first column) so
+        st.dataframe serializes it straight to Arrow IPC with no
+        pandas->Arrow conversion on each rerun."""
+        arr = df.to_numpy(dtype=np.float64, na_value=np.nan, copy=True)
+        max_val = np.nanmax(np.abs(arr)) if arr.size else 0.0
+        scale, unit = (1e-9, "$B") if max_val >= 1e9 else (1e-6, "$M")
+        arr *= scale
+        np.round(arr, 2, out=arr)
+        names = ['Item'] + [c.strftime('%Y-%m-%d') if hasattr(c, 'strftime') else str(c)
+                            for c in df.columns]
+        cols = [pa.array(df.index.astype(str))] + [pa.array(arr[:, i]) for i in range(arr.shape[1])]
+        return pa.Table.from_arrays(cols, names=names), unit
+
+    @staticmethod
+    @st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+    def statement_arrow(symbol, name):
+        """One scaled statement as (Arrow IPC bytes, unit).
+
+        The frames are immutable once fetched, so the scaling pass and
+        the Arrow serialization run once per (ticker, statement); tab
+        switches replay raw bytes instead of re-pickling a DataFrame
+        through the cache and re-converting it per render."""
+        stmts = QuantEngine.fetch_statements(symbol)
+        if not stmts or stmts.get(name) is None:
+            return None
+        table, unit = QuantEngine.scale_statement(stmts[name])
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes(), unit
+
+    @staticmethod
+    def _incremental_update(symbol, period):
+        """Extend yesterday's cached Parquet with only the missing bars.
+
+        Refreshing MAX history re-downloads decades of bars to add one
+        row; fetching from the last cached date moves kilobytes instead
+        of megabytes. Returns None (forcing a full pull) when there is
+        no prior snapshot or a dividend/split landed, since those
+        re-adjust the entire back history."""
+        prev = sorted(_HIST_CACHE.glob(f"{symbol}_{period}_*.parquet"))
+        if not prev:
+            return None
+        try:
+            last = pd.read_parquet(prev[-1], engine='pyarrow')
+            new = QuantEngine._ticker(symbol).history(
+                start=last.index[-1].date(), auto_adjust=True)
+        except Exception:
+            return None
+        for stale in prev:
+            stale.unlink(missing_ok=True)
+        if new.empty:
+            return last
+        for action in ('Dividends', 'Stock Splits'):
+            if action in new.columns and (new[action] != 0).any():
+                return None
+        hist = pd.concat([last.iloc[:-1], new])
+        # Bounded windows slide: without re-trimming, each refresh leaves
+        # yesterday's oldest bar in place and a "1y" snapshot creeps
+        # toward MAX one day per day.
+        span = _PERIOD_SPANS.get(period)
+        if span is not None:
+            hist = hist[hist.index >= hist.index[-1] - span]
+        return hist
+
+    @staticmethod
+    def _download_history(symbol, period, path):
+        hist = QuantEngine._incremental_update(symbol, period)
+        if hist is None:
+            try:
+                hist = QuantEngine._ticker(symbol).history(period=period, auto_adjust=True)
+                if hist.empty:
+                    return None
+            except Exception:
+                return None
+        # float32 is plenty for chart/valuation precision and halves the
+        # bytes moved through the pickle cache, Parquet and Plotly JSON.
+        ohlc = [c for c in ('Open', 'High', 'Low', 'Close') if c in hist.columns]
+        hist[ohlc] = hist[ohlc].astype('float32')
+        if 'Volume' in hist.columns:
+            hist['Volume'] = hist['Volume'].astype('int64')
+        _HIST_CACHE.mkdir(parents=True, exist_ok=True)
+        hist.to_parquet(path, compression='zstd', engine='pyarrow')
+        return hist
+
+    @staticmethod
+    def _pull_history(symbol, period):
+        # L2 disk cache keyed by day: restarts and fresh replicas read the
+        # multi-megabyte MAX history from local Parquet instead of Yahoo.
+        # Short periods never read it — serving a day-keyed file would
+        # freeze 1d-1y charts until midnight and nullify their 60s TTL;
+        # for them the Parquet is only the write-through seed that keeps
+        # the incremental refresh fetching days instead of the window.
+        path = _HIST_CACHE / f"{symbol}_{period}_{date.today()}.parquet"
+        if path.exists() and period not in _SHORT_PERIODS:
+            return pd.read_parquet(path, engine='pyarrow')
+        key = f"{symbol}:{period}"
+        with _inflight_lock:
+            fut = _inflight.get(key)
+            if fut is None:
+                _inflight[key] = fut = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            # Another session is already downloading this ticker; wait on
+            # its Future instead of duplicating the request.
+            return fut.result()
+        hist = None
+        try:
+            hist = QuantEngine._download_history(symbol, period, path)
+        finally:
+            with _inflight_lock:
+                del _inflight[key]
+            fut.set_result(hist)
+        return hist
+
+    @staticmethod
+    @st.cache_data(ttl=60, max_entries=64, show_spinner=False)
+    def _history_short(symbol, period):
+        return QuantEngine._pull_history(symbol, period)
+
+    @staticmethod
+    @st.cache_data(ttl=3600, max_entries=32, show_spinner="Fetching market data...")
+    def _history_long(symbol, period):
+        return QuantEngine._pull_history(symbol, period)
+
+    @staticmethod
+    def fetch_history(symbol, period="max"):
+        """Daily OHLCV history, cached per (symbol, period).
+
+        Short ranges are cheap to refetch and staleness shows, so they get
+        a 60s TTL; multi-year pulls keep 1h. Splitting the entries also
+        stops a short-range refresh from evicting the expensive MAX pull."""
+        if period in _SHORT_PERIODS:
+            return QuantEngine._history_short(symbol, period)
+        return QuantEngine._history_long(symbol, period)
+
+    @staticmethod
+    @st.cache_data(ttl=3600, max_entries=64, show_spinner="Fetching statements...")
+    def fetch_statements(symbol):
+        """Annual statement frames, fetched explicitly per statement so the
+        code only pays for what it reads."""
+        try:
+            t = QuantEngine._ticker(symbol)
+            return {
+                'Income Statement': t.get_financials(),
+                'Balance Sheet': t.get_balance_sheet(),
+                'Cash Flow': t.get_cashflow(),
+            }
+        except Exception:
+            return None
@@ -0,0 +1,132 @@
+import os
+import time
+
+import numpy as np
+import orjson
+import pandas as pd
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session so the ticker-map and companyfacts calls reuse
+# one TLS handshake instead of reconnecting per request. Responses persist
+# to SQLite so cold boots re-read from disk instead of re-downloading the
+# ~5MB companyfacts payloads; st.cache_data stays on top as the L1.
+_SESSION = CachedSession(".cache/sec", backend="sqlite", expire_after=3600,
+                         allowable_codes=[200], cache_control=True)
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16, pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])))
+
+_CACHE_DIR = ".cache"
+_PARQUET_TTL = 86400  # cleaned metric frames are refreshed daily
+
+
+# --- SEC DATA ENGINE ---
+class SECEngine:
+    HEADERS = {'User-Agent': "TerminalApp researcher@example.com"}
+    # Only the tags the terminal actually renders; everything else in the
+    # ~5MB companyfacts tree is dropped at parse time.
+    WANTED_TAGS = frozenset({
+        'Revenues', 'RevenueFromContractWithCustomerExcludingAssessedTax',
+        'SalesRevenueNet', 'NetIncomeLoss', 'StockholdersEquity',
+    })
+    # Revenue tag fallback chain, in preference order
+    REV_TAGS = ('Revenues', 'RevenueFromContractWithCustomerExcludingAssessedTax',
+                'SalesRevenueNet')
+
+    @staticmethod
+    @st.cache_resource(ttl=86400)
+    def get_cik_index():
+        """Sorted (tickers, ciks) arrays for binary-search lookup.
+
+        ~100KB of contiguous fixed-width bytes + uint32 instead of a ~1MB
+        dict of 13k Python strings; cache_resource hands the same arrays
+        back by reference with no pickle round-trip."""
+        url = "https://www.sec.gov/files/company_tickers.json"
+        r = _SESSION.get(url, headers=SECEngine.HEADERS, timeout=10)
+        j = r.json()
+        tks = np.array([v['ticker'] for v in j.values()], dtype='S10')
+        ciks = np.fromiter((v['cik_str'] for v in j.values()), dtype=np.uint32, count=len(j))
+        order = np.argsort(tks)
+        return tks[order], ciks[order]
+
+    @staticmethod
+    def lookup_cik(ticker):
+        """Resolve a ticker to its zero-padded CIK, or None if unknown."""
+        tks, ciks = SECEngine.get_cik_index()
+        key = ticker.encode()
+        i = np.searchsorted(tks, key)
+        if i < len(tks) and tks[i] == key:
+            return f"{ciks[i]:010d}"
+        return None
+
+    @staticmethod
+    @st.cache_data(ttl=3600, max_entries=64, show_spinner="Fetching SEC filings...")
+    def fetch_sec_facts(cik):
+        """Returns {tag: USD fact list} for WANTED_TAGS only, keeping the
+        cached object small instead of holding the full companyfacts tree."""
+        url = f"https://data.sec.gov/api/xbrl/companyfacts/CIK{cik}.json"
+        r = _SESSION.get(url, headers=SECEngine.HEADERS, timeout=10)
+        if r.status_code != 200:
+            return None
+        gaap = orjson.loads(r.content)['facts']['us-gaap']
+        return {tag: gaap[tag]['units'].get('USD', [])
+                for tag in SECEngine.WANTED_TAGS if tag in gaap}
+
+    @staticmethod
+    @st.cache_data(max_entries=256, show_spinner=False)
+    def pick_rev_tag(cik, available: frozenset):
+        """Resolve the revenue tag for a filer once; reruns hit the cache
+        keyed by CIK instead of re-walking the fallback chain."""
+        return next((t for t in SECEngine.REV_TAGS if t in available), 'Revenues')
+
+    @staticmethod
+    def get_clean_metric(data, tag, cik=None):
+        """Standardizes 15-year history and eliminates duplicate filings per year.
+
+        Cleaned frames are persisted to .cache/{cik}_{tag}.parquet so warm
+        runs skip the JSON->DataFrame conversion entirely."""
+        path = os.path.join(_CACHE_DIR, f"{cik}_{tag}.parquet") if cik else None
+        if path and os.path.exists(path) and time.time() - os.path.getmtime(path) < _PARQUET_TTL:
+            return pd.read_parquet(path, columns=['end', 'year', 'val', 'form'],
+                                   engine='pyarrow', dtype_backend='pyarrow')
+        # Explicit guards instead of a bare except around the whole build:
+        # the common failure modes (no facts, unknown tag) return early and
+        # real bugs in the array math surface instead of becoming an
+        # empty-frame mystery.
+        facts = data.get(tag) if data else None
+        if not facts:
+            return pd.DataFrame()
+        # Build column arrays directly: SEC 'end' is always YYYY-MM-DD,
+        # so datetime64[D] skips the slow dateutil parsing path. A narrow
+        # except covers malformed fact entries only.
+        try:
+            ends = np.fromiter((f['end'] for f in facts), dtype='datetime64[D]', count=len(facts))
+            filed = np.fromiter((f['filed'] for f in facts), dtype='datetime64[D]', count=len(facts))
+            vals = np.fromiter((f['val'] for f in facts), dtype='f8', count=len(facts))
+            forms = [f['form'] for f in facts]
+        except (KeyError, ValueError, TypeError):
+            return pd.DataFrame()
+        # Arrow-backed columns: UTF-8 array for 'form' instead of Python
+        # object strings, and ~2-4x smaller frames end to end.
+        df = pd.DataFrame({
+            'end': pd.array(ends.astype('datetime64[ns]'), dtype='timestamp[ns][pyarrow]'),
+            'filed': pd.array(filed.astype('datetime64[ns]'), dtype='timestamp[ns][pyarrow]'),
+            'val': pd.array(vals, dtype='float64[pyarrow]'),
+            'form': pd.array(forms, dtype='string[pyarrow]'),
+        })
+        df['year'] = df['end'].dt.year
+        # Keep the latest period end per year, then the most recently filed
+        # fact among ties — a 10-K/A restates the same period end as the
+        # original 10-K, so only the filed date tells them apart. Two O(n)
+        # passes, no full-frame sort; the final sort runs on the small
+        # deduplicated result only.
+        latest_end = df['end'].eq(df.groupby('year', sort=False)['end'].transform('max'))
+        idx = df[latest_end].groupby('year', sort=False)['filed'].idxmax()
+        df = df.loc[idx].sort_values('year').drop(columns='filed')
+        if path and not df.empty:
+            os.makedirs(_CACHE_DIR, exist_ok=True)
+            df[['end', 'year', 'val', 'form']].to_parquet(path, compression='snappy', engine='pyarrow')
+        return df
@@ -0,0 +1,315 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import pyarrow as pa
+import streamlit as st
+
+from quant_engine import QuantEngine
+from sec_engine import SECEngine
+
+# --- 1. INSTITUTIONAL LIGHT THEME (Marquee Slate) ---
+# The theme rules live in static/terminal.css, served by Streamlit's
+# static-asset endpoint (see .streamlit/config.toml): the browser caches
+# the file, so each rerun re-sends only this one-line link from main().
+_CSS_LINK = '<link rel="stylesheet" href="app/static/terminal.css">'
+
+# Shared Plotly layout, built once instead of per-figure per-rerun
+_PLOTLY_LAYOUT = dict(template="simple_white", height=500, hovermode="x unified")
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def dcf_grid(rev_base):
+    """Fair value over the full (growth, wacc) slider grid in one broadcast.
+
+    Slider moves then index into the cached matrix instead of re-running
+    the valuation; 0.001 grid step matches the 0.1% slider step. Cells
+    where growth reaches the discount rate have no finite Gordon value
+    and carry NaN — the caller renders those as N/A, and Plotly leaves
+    them blank in the heatmap."""
+    g = np.linspace(0.0, 0.05, 51)
+    w = np.linspace(0.05, 0.15, 101)
+    G, W = np.meshgrid(g, w, indexing='ij')
+    with np.errstate(divide='ignore', invalid='ignore'):
+        term = rev_base * (1 + G) / (W - G)
+    return np.where(W > G, (rev_base + term) / ((1 + W) ** 5), np.nan), g, w
+
+
+@st.cache_data(ttl=3600, max_entries=32, show_spinner=False)
+def price_figure_json(ticker, period, n_rows, last_close):
+    """Prebuilt price figure JSON, keyed by ticker/period/rows/last close.
+
+    Slider and control reruns reuse the serialized figure instead of
+    paying Plotly's Python-side trace validation and layout build again.
+    n_rows busts the entry when bars are added; last_close busts it when
+    the short-TTL history refreshes the current bar in place — without
+    it the chart could lag the KPI quote by up to the hour-long TTL."""
+    hist = QuantEngine.fetch_history(ticker, period)
+    if hist is None:
+        return None
+    if len(hist) > 2000:
+        # Beyond ~2000 bars a 1280px chart can't resolve daily candles;
+        # weekly OHLC is visually identical with ~5x fewer points shipped
+        # to the browser.
+        hist = hist.resample('W').agg({'Open': 'first', 'High': 'max',
+                                       'Low': 'min', 'Close': 'last'}).dropna()
+    # Hand Plotly plain ndarrays (and ISO date strings for x) so its
+    # validators skip the pandas introspection and to_numpy copy per
+    # Series on every rerun.
+    x = hist.index.strftime('%Y-%m-%d').to_numpy()
+    if len(hist) > 1500:
+        # SVG candlesticks thrash the browser DOM at this point count;
+        # a WebGL close line with a high/low band renders 10k+ points
+        # at full frame rate with the same information at that zoom.
+        fig_px = go.Figure([
+            go.Scatter(x=x, y=hist['Low'].to_numpy(), mode='lines',
+                       line=dict(width=0), showlegend=False, hoverinfo='skip'),
+            go.Scatter(x=x, y=hist['High'].to_numpy(), mode='lines', line=dict(width=0),
+                       fill='tonexty', fillcolor='rgba(0,82,204,0.12)', name="High/Low"),
+            go.Scattergl(x=x, y=hist['Close'].to_numpy(), mode='lines',
+                         line=dict(color='#0052cc', width=2), name="Close"),
+        ])
+    else:
+        fig_px = go.Figure(go.Candlestick(
+            x=x,
+            open=hist['Open'].to_numpy(), high=hist['High'].to_numpy(),
+            low=hist['Low'].to_numpy(), close=hist['Close'].to_numpy(), name="OHLC"))
+    fig_px.update_layout(**_PLOTLY_LAYOUT, xaxis_title="Date",
+                         yaxis_title="Price (USD)", xaxis_rangeslider_visible=False)
+    return fig_px.to_json()
+
+
+def _prefetch_default():
+    try:
+        QuantEngine._pull_history("AAPL", "max")
+    except Exception:
+        pass
+
+
+@st.cache_resource
+def _warmup():
+    """Kick off the default-ticker prefetch once per process.
+
+    Cold-start latency for the first visitor is dominated by the uncached
+    AAPL history pull, but running it inline made that visitor pay for
+    the warmup. A daemon thread fills the disk L2 instead (the cached
+    wrappers need a ScriptRunContext, _pull_history doesn't); the first
+    real fetch then reads local Parquet, or waits on this download's
+    in-flight Future if it races it."""
+    threading.Thread(target=_prefetch_default, daemon=True).start()
+    return True
+
+
+# --- 2. TERMINAL INTERFACE ---
+def main():
+    # Per-session calls, not module-level: ui.py is imported once per
+    # process, so anything at top level runs only for the first script
+    # run and every later session would miss page config and theme.
+    st.set_page_config(page_title="Finance Terminal", layout="wide")
+    st.markdown(_CSS_LINK, unsafe_allow_html=True)
+    _warmup()
+
+    with st.sidebar:
+        st.title("📂 Terminal")
+        # A form batches the widgets: typing an intermediate ticker no
+        # longer triggers a rerun (and a Yahoo/SEC fetch) per keystroke —
+        # the pipeline runs only when LOAD commits the values.
+        with st.form("controls"):
+            ticker = st.text_input("SECURITY SEARCH", "AAPL").upper()
+            st.divider()
+            # Time-Travel selection
+            timeframe = st.radio("TIME-TRAVEL", ["1Y", "5Y", "10Y", "MAX"], index=3)
+            st.form_submit_button("LOAD", use_container_width=True)
+
+    cik = SECEngine.lookup_cik(ticker)
+    if cik is None:
+        st.error("TICKER NOT FOUND")
+        return
+    raw_data = SECEngine.fetch_sec_facts(cik)
+    if not raw_data: return
+
+    # Metric Extraction
+    rev_tag = SECEngine.pick_rev_tag(cik, frozenset(raw_data))
+    # The three metrics are independent Parquet/JSON reads; overlap them.
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futures = {key: ex.submit(SECEngine.get_clean_metric, raw_data, tag, cik)
+                   for key, tag in [('rev', rev_tag), ('net', 'NetIncomeLoss'),
+                                    ('eq', 'StockholdersEquity')]}
+        results = {key: f.result() for key, f in futures.items()}
+    df_rev, df_net, df_eq = results['rev'], results['net'], results['eq']
+
+    # Apply Time-Travel Filters
+    curr_yr = datetime.now().year
+    lookback = {"1Y": 1, "5Y": 5, "10Y": 10, "MAX": 50}[timeframe]
+    df_rev = df_rev[df_rev['year'] >= curr_yr - lookback]
+    df_net = df_net[df_net['year'] >= curr_yr - lookback]
+
+    # --- ROW 1: KPI HERO ---
+    profile = QuantEngine.fetch_profile(ticker)
+    if profile and profile['longName']:
+        st.header(f"Finance Terminal | {profile['longName']} ({ticker})")
+        if profile['sector']:
+            st.caption(f"{profile['sector']} · {profile['industry']}")
+    else:
+        st.header(f"Finance Terminal | {ticker}")
+    c1, c2, c3, c4 = st.columns(4)
+    # Pull the value column out to a plain ndarray once; the KPI row and
+    # DCF math then index that instead of going through pandas' indexer
+    # protocol on every slider-driven rerun.
+    rev_arr = df_rev['val'].to_numpy(dtype=np.float64) if not df_rev.empty else np.empty(0)
+    latest_rev = float(rev_arr[-1]) if rev_arr.size else 0.0
+    c1.metric("LTM REVENUE", f"${latest_rev/1e9:.2f}B")
+    c2.metric("DATA DEPTH", f"{len(df_rev)}Y")
+    c3.metric("TIME-FRAME", timeframe)
+    c4.metric("CIK", cik)
+
+    # Market snapshot (Yahoo fast_info)
+    quote = QuantEngine.fetch_quote(ticker)
+    if quote:
+        # fast_info returns without raising but with None fields for
+        # funds, trusts and thinly covered symbols — guard each one like
+        # the peer table does instead of letting the f-string TypeError.
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("LAST PRICE", f"${quote['currentPrice']:,.2f}" if quote['currentPrice'] else "N/A")
+        m2.metric("MARKET CAP", f"${quote['marketCap']/1e9:,.1f}B" if quote['marketCap'] else "N/A")
+        m3.metric("52W HIGH", f"${quote['fiftyTwoWeekHigh']:,.2f}" if quote['fiftyTwoWeekHigh'] else "N/A")
+        m4.metric("52W LOW", f"${quote['fiftyTwoWeekLow']:,.2f}" if quote['fiftyTwoWeekLow'] else "N/A")
+
+    # --- ROW 2: SECTIONS ---
+    # st.tabs executes every tab body on each rerun, visible or not, so a
+    # user who never opens Statements would still pay its Yahoo fetches.
+    # Radio-driven navigation runs only the active section.
+    view = st.radio("VIEW", ["📈 PERFORMANCE", "📑 STATEMENTS", "📊 RATIO TRENDS", "💰 DCF", "👥 PEER COMP"],
+                    horizontal=True, label_visibility="collapsed")
+
+    if view == "📈 PERFORMANCE":
+        # Performance Line Graph
+        st.subheader(f"Historical Revenue Trajectory: {timeframe}")
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=df_rev['year'], y=df_rev['val'], mode='lines+markers',
+                                 line=dict(color='#0052cc', width=3), name="Annual Revenue"))
+        fig.update_layout(**_PLOTLY_LAYOUT, xaxis_title="Fiscal Year", yaxis_title="Revenue (USD)")
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Price Action Candlestick
+        st.subheader(f"Price Action: {timeframe}")
+        period = {"1Y": "1y", "5Y": "5y", "10Y": "10y", "MAX": "max"}[timeframe]
+        hist = QuantEngine.fetch_history(ticker, period)
+        if hist is not None:
+            fig_json = price_figure_json(ticker, period, len(hist),
+                                         float(hist['Close'].iloc[-1]))
+            if fig_json:
+                st.plotly_chart(json.loads(fig_json), use_container_width=True)
+
+    elif view == "📑 STATEMENTS":
+        # Scaled Financial Statements
+        st.subheader("Standardized Income Statement (Billions USD)")
+        stmt_df = df_rev[['year', 'val', 'form']].sort_values('year', ascending=False).copy()
+        stmt_df['val'] = (stmt_df['val'] / 1e9).round(2)
+        stmt_df.columns = ["Year", "Revenue ($B)", "Filing Type"]
+        st.dataframe(stmt_df, use_container_width=True, hide_index=True)
+
+        st.subheader("Market Statements (Yahoo Finance)")
+        s_choice = st.selectbox("STATEMENT", ["Income Statement", "Balance Sheet", "Cash Flow"])
+        cached = QuantEngine.statement_arrow(ticker, s_choice)
+        if cached is not None:
+            arrow_bytes, unit = cached
+            st.caption(f"All figures in {unit}")
+            st.dataframe(pa.ipc.open_stream(arrow_bytes).read_all(), use_container_width=True)
+
+    elif view == "📊 RATIO TRENDS":
+        st.subheader("10-Year Profitability & Ratio Trends")
+        if not df_rev.empty and not df_net.empty:
+            # Frames are already one row per year, so declare the 1:1 unique-key
+            # merge explicitly and skip the duplicate scan; copy-on-write
+            # already makes the result lazily shared.
+            merged = pd.merge(df_rev[['year', 'val']], df_net[['year', 'val']], on='year',
+                              how='inner', validate='one_to_one', suffixes=('_r', '_n'))
+            ratio_cols = ['Net Margin (%)']
+            if not df_eq.empty:
+                merged = pd.merge(merged, df_eq[['year', 'val']].rename(columns={'val': 'val_e'}), on='year',
+                                  how='inner', validate='one_to_one')
+                ratio_cols.append('ROE (%)')
+            # One stacked (k, N) division computes every ratio series at
+            # once instead of a separate aligned pandas op per ratio.
+            net_vals = merged['val_n'].to_numpy(dtype=np.float64)
+            dens = np.vstack([merged[c].to_numpy(dtype=np.float64)
+                              for c in (['val_r', 'val_e'] if 'val_e' in merged.columns else ['val_r'])])
+            ratios = np.round(net_vals / dens * 100, 2)
+            for col, row in zip(ratio_cols, ratios):
+                merged[col] = row
+
+            # Trend Chart
+            st.line_chart(merged.set_index('year')[ratio_cols], color=["#0052cc", "#ff8b00"][:len(ratio_cols)])
+
+            # Ratio Horizontal Table (Unique Columns Guaranteed)
+            ratio_tab = merged[['year'] + ratio_cols].set_index('year').T
+            st.dataframe(ratio_tab, use_container_width=True)
+
+        # Latest fiscal-year snapshot from the market statements
+        stmts = QuantEngine.fetch_statements(ticker)
+        if stmts and stmts['Balance Sheet'] is not None:
+            bs_items = QuantEngine.extract_items(
+                stmts['Balance Sheet'],
+                ('Stockholders Equity', 'Total Assets', 'Total Debt',
+                 'Current Assets', 'Current Liabilities'))
+            st.subheader("Latest Fiscal Year Snapshot")
+            s1, s2, s3 = st.columns(3)
+            assets, equity = bs_items.get('Total Assets', 0.0), bs_items.get('Stockholders Equity', 0.0)
+            curr_l = bs_items.get('Current Liabilities', 0.0)
+            s1.metric("DEBT / EQUITY", f"{bs_items.get('Total Debt', 0.0) / equity:.2f}" if equity else "N/A")
+            s2.metric("CURRENT RATIO", f"{bs_items.get('Current Assets', 0.0) / curr_l:.2f}" if curr_l else "N/A")
+            s3.metric("EQUITY / ASSETS", f"{equity / assets:.2f}" if assets else "N/A")
+
+    elif view == "💰 DCF":
+        st.subheader("Intrinsic Value Projection Matrix")
+        # Localized Controls
+        col_s1, col_s2 = st.columns(2)
+        growth = col_s1.slider("Terminal Growth (%)", 0.0, 5.0, 2.5, step=0.1) / 100
+        wacc = col_s2.slider("Discount Rate / WACC (%)", 5.0, 15.0, 8.5, step=0.1) / 100
+
+        # Use reported free cash flow when Yahoo has it; annual revenue
+        # stays as the fallback proxy.
+        dcf_stmts = QuantEngine.fetch_statements(ticker)
+        fcf = QuantEngine.get_val(dcf_stmts['Cash Flow'], 'Free Cash Flow') \
+            if dcf_stmts and dcf_stmts['Cash Flow'] is not None else 0.0
+        fcf_base, basis = (fcf, "FCF") if fcf > 0 else (latest_rev, "REVENUE PROXY")
+
+        # O(1) lookup into the precomputed sensitivity matrix
+        grid, g_axis, w_axis = dcf_grid(fcf_base)
+        fair_val = grid[int(round(growth * 1000)), int(round((wacc - 0.05) * 1000))]
+        st.metric(f"ESTIMATED FAIR VALUE ({basis} BASIS)",
+                  f"${fair_val/1e9:.2f}B" if np.isfinite(fair_val) else "N/A")
+        st.caption("Intrinsic value from reported free cash flow, falling back to annual revenue.")
+
+        # The matrix the section title promises: a coarse slice of the
+        # cached grid, so the heatmap costs zero extra valuation math.
+        g_idx, w_idx = np.arange(0, 51, 5), np.arange(0, 101, 5)
+        heat = go.Figure(go.Heatmap(
+            z=grid[np.ix_(g_idx, w_idx)] / 1e9,
+            x=np.round(w_axis[w_idx] * 100, 1), y=np.round(g_axis[g_idx] * 100, 1),
+            colorscale='Blues', colorbar=dict(title="Fair Value ($B)")))
+        heat.update_layout(**_PLOTLY_LAYOUT, xaxis_title="WACC (%)",
+                           yaxis_title="Terminal Growth (%)")
+        st.plotly_chart(heat, use_container_width=True)
+
+    elif view == "👥 PEER COMP":
+        st.subheader("Peer Comparison")
+        peers_raw = st.text_input("PEER GROUP (comma-separated)", "MSFT,GOOGL,AMZN,META")
+        peer_list = tuple(dict.fromkeys(p.strip().upper() for p in peers_raw.split(',') if p.strip()))
+        if peer_list:
+            peer_data = QuantEngine.fetch_peer_quotes((ticker,) + peer_list)
+            rows = [{'Ticker': sym,
+                     'Price': q['currentPrice'],
+                     'Market Cap ($B)': round(q['marketCap'] / 1e9, 1) if q['marketCap'] else None,
+                     'P/E (TTM)': round(q['trailingPE'], 1) if q['trailingPE'] else None,
+                     'Net Margin (%)': round(q['profitMargins'] * 100, 1) if q['profitMargins'] else None,
+                     '52W High': q['fiftyTwoWeekHigh'],
+                     '52W Low': q['fiftyTwoWeekLow']}
+                    for sym, q in peer_data.items() if q]
+            if rows:
+                st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)